@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+
+"""
+Inventory Audit Benchmark
+Measures the audit tool's own throughput against a local stub of the application
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import resource
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from socketserver import ThreadingMixIn
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from audit_system import InventoryAuditSystem, Colors
+
+# Stand-in page used when no recorded body exists for a path
+SYNTHETIC_BODY = (
+    "<html><head><title>Inventory</title><link rel='stylesheet' href='/_next/static/css/app.css'>"
+    "<script src='/_next/static/chunks/main.js'></script></head><body>"
+    "<nav>menu sidebar header dashboard products</nav>"
+    "<form><label for='q'>Search</label><input id='q'><button type='submit'>Search</button></form>"
+    + "<div class='card'><img src='/placeholder.png' alt='product'>product item total barcode ai agent</div>" * 150
+    + "</body></html>"
+)
+
+class StubStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.bytes_sent = 0
+        self.failures = 0
+    
+    def snapshot(self) -> Dict[str, int]:
+        with self.lock:
+            return {"requests": self.requests, "bytes_sent": self.bytes_sent, "failures": self.failures}
+
+class StubServer:
+    """Local HTTP stand-in for the Next.js dev server with latency, size and failure injection"""
+    
+    def __init__(self, bodies_dir: Optional[Path] = None, latency_ms: float = 50.0, jitter_ms: float = 0.0,
+                 body_size: Optional[int] = None, error_rate: float = 0.0, reset_rate: float = 0.0, seed: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.body_size = body_size
+        self.error_rate = error_rate
+        self.reset_rate = reset_rate
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+        self.stats = StubStats()
+        self.bodies = self.load_bodies(bodies_dir) if bodies_dir else {}
+        self.server: Optional[HTTPServer] = None
+    
+    @staticmethod
+    def load_bodies(bodies_dir: Path) -> Dict[str, bytes]:
+        """Recorded bodies by request path, as written by --record"""
+        with open(bodies_dir / "manifest.json", "r") as f:
+            manifest = json.load(f)
+        return {path: (bodies_dir / name).read_bytes() for path, name in manifest.items()}
+    
+    def body_for(self, path: str) -> bytes:
+        body = self.bodies.get(path) or SYNTHETIC_BODY.encode()
+        if self.body_size is not None:
+            # Repeat or truncate to the requested size
+            body = (body * (self.body_size // len(body) + 1))[:self.body_size]
+        return body
+    
+    def draw(self) -> float:
+        with self.random_lock:
+            return self.random.random()
+    
+    def delay(self) -> float:
+        with self.random_lock:
+            jitter = self.random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.latency_ms + jitter) / 1000
+    
+    def respond(self, handler: BaseHTTPRequestHandler) -> None:
+        length = int(handler.headers.get("Content-Length") or 0)
+        if length:
+            handler.rfile.read(length)
+        path = urlparse(handler.path).path
+        
+        with self.stats.lock:
+            self.stats.requests += 1
+        time.sleep(self.delay())
+        
+        draw = self.draw()
+        if draw < self.reset_rate:
+            # Drop the connection without a response
+            with self.stats.lock:
+                self.stats.failures += 1
+            handler.close_connection = True
+            handler.connection.shutdown(socket.SHUT_RDWR)
+            return
+        
+        content_type = "text/html; charset=utf-8"
+        if draw < self.reset_rate + self.error_rate:
+            status, body = 500, b"Internal Server Error"
+            with self.stats.lock:
+                self.stats.failures += 1
+        elif path.startswith("/api/"):
+            content_type = "application/json"
+            # The barcode lookup rejects the audit's deliberately invalid payload
+            status = 400 if handler.command == "POST" and "barcode" in path else 200
+            body = self.bodies.get(path) or b'{"ok": true, "results": []}'
+        elif "invalid-route" in path:
+            status, body = 404, b"<html><body>404: This page could not be found.</body></html>"
+        else:
+            status, body = 200, self.body_for(path)
+        
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        if handler.command != "HEAD":
+            handler.wfile.write(body)
+            with self.stats.lock:
+                self.stats.bytes_sent += len(body)
+    
+    def start(self, port: int = 0) -> str:
+        stub = self
+        
+        class StubHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; with Nagle on, a keep-alive
+            # client's delayed ACK stalls every response by ~40ms
+            disable_nagle_algorithm = True
+            
+            def do_GET(self) -> None:
+                stub.respond(self)
+            
+            do_POST = do_PUT = do_DELETE = do_HEAD = do_GET
+            
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+        
+        class ThreadingServer(ThreadingMixIn, HTTPServer):
+            daemon_threads = True
+        
+        self.server = ThreadingServer(("127.0.0.1", port), StubHandler)
+        threading.Thread(target=self.server.serve_forever, name="stub-server", daemon=True).start()
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+    
+    def stop(self) -> None:
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+def directory_bytes(path: Path) -> int:
+    return sum(file.stat().st_size for file in path.rglob("*") if file.is_file())
+
+def record_bodies(base_url: str, bodies_dir: Path) -> None:
+    """Save the live application's page bodies for later replay"""
+    bodies_dir.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory() as scratch:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            audit_system = InventoryAuditSystem(Path(scratch), base_url=base_url)
+            pages = dict(audit_system.pages)
+            audit_system.close()
+    
+    manifest = {}
+    for page_name, page_info in pages.items():
+        path = urlparse(page_info["url"]).path or "/"
+        response = requests.get(page_info["url"], timeout=30)
+        name = f"{page_name}.html"
+        (bodies_dir / name).write_bytes(response.content)
+        manifest[path] = name
+        print(f"{Colors.GREEN}Recorded {path} ({len(response.content)} bytes){Colors.NC}")
+    
+    with open(bodies_dir / "manifest.json", "w") as f:
+        json.dump(manifest, f, indent=2)
+
+class AuditBenchmark:
+    """Runs audit_page and full_audit against a stub server in scratch audit directories"""
+    
+    def __init__(self, stub: StubServer, base_url: str, workers: int = 1, quiet: bool = True, trace_memory: bool = False,
+                 audit_options: Optional[Dict[str, Any]] = None):
+        self.stub = stub
+        self.base_url = base_url
+        self.workers = workers
+        self.quiet = quiet
+        self.trace_memory = trace_memory
+        self.audit_options = audit_options or {}
+    
+    def run(self, scenario: str, repeat: int = 1) -> Dict[str, Any]:
+        audit_dir = Path(tempfile.mkdtemp(prefix="audit_benchmark_"))
+        # Reports read the comparison config, so give them the real one
+        config = Path(__file__).parent / "baseline" / "comparison_config.json"
+        if config.exists():
+            (audit_dir / "baseline").mkdir()
+            shutil.copy(config, audit_dir / "baseline")
+        
+        before = self.stub.stats.snapshot()
+        if self.trace_memory:
+            tracemalloc.start()
+        output = open(os.devnull, "w") if self.quiet else sys.stdout
+        
+        try:
+            with contextlib.redirect_stdout(output):
+                audit_system = InventoryAuditSystem(audit_dir, base_url=self.base_url, page_delay=0.0, **self.audit_options)
+                started = time.perf_counter()
+                try:
+                    audit_system.initialize_session()
+                    pages = 0
+                    for _ in range(repeat):
+                        if scenario == "page":
+                            for page_name in audit_system.pages:
+                                audit_system.audit_page(page_name)
+                        else:
+                            audit_system.full_audit(workers=self.workers)
+                        pages += len(audit_system.pages)
+                finally:
+                    # Flushing logs and session state is part of the tool's cost
+                    audit_system.close()
+                elapsed = time.perf_counter() - started
+        finally:
+            if self.quiet:
+                output.close()
+        
+        peak_traced = None
+        if self.trace_memory:
+            peak_traced = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        
+        after = self.stub.stats.snapshot()
+        result = {
+            "scenario": scenario,
+            "workers": self.workers if scenario == "full" else 1,
+            "pages": pages,
+            "seconds": round(elapsed, 3),
+            "pages_per_sec": round(pages / elapsed, 2),
+            "requests": after["requests"] - before["requests"],
+            "requests_per_sec": round((after["requests"] - before["requests"]) / elapsed, 2),
+            "injected_failures": after["failures"] - before["failures"],
+            "bytes_received": after["bytes_sent"] - before["bytes_sent"],
+            "bytes_written": directory_bytes(audit_dir),
+            # High-water mark of the whole process, so later scenarios include earlier ones
+            "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            "peak_traced_bytes": peak_traced
+        }
+        shutil.rmtree(audit_dir, ignore_errors=True)
+        return result
+
+def print_results(results: list) -> None:
+    header = (f"{'scenario':<10}{'workers':>8}{'pages':>7}{'seconds':>9}{'pages/s':>9}{'req/s':>9}"
+              f"{'failures':>9}{'written KB':>12}{'peak RSS MB':>13}{'peak heap MB':>14}")
+    print(f"{Colors.BLUE}{header}{Colors.NC}")
+    for result in results:
+        heap = f"{result['peak_traced_bytes'] / 1048576:.1f}" if result["peak_traced_bytes"] is not None else "-"
+        print(f"{result['scenario']:<10}{result['workers']:>8}{result['pages']:>7}{result['seconds']:>9.2f}"
+              f"{result['pages_per_sec']:>9.2f}{result['requests_per_sec']:>9.1f}{result['injected_failures']:>9}"
+              f"{result['bytes_written'] / 1024:>12.1f}{result['peak_rss_kb'] / 1024:>13.1f}{heap:>14}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the inventory audit tool against a local stub server")
+    parser.add_argument("--scenario", choices=["page", "full", "all"], default="all",
+                        help="page: audit_page over every page, full: full_audit (default: all)")
+    parser.add_argument("--repeat", type=int, default=1, help="Audit passes per scenario (default: 1)")
+    parser.add_argument("--workers", type=int, default=1, help="Workers for the full_audit scenario (default: 1)")
+    parser.add_argument("--bodies", type=Path, help="Directory of recorded page bodies to replay (see --record)")
+    parser.add_argument("--record", type=Path, help="Record page bodies from --base-url into this directory and exit")
+    parser.add_argument("--base-url", default="http://localhost:3000", help="Live application for --record")
+    parser.add_argument("--port", type=int, default=0, help="Stub server port (default: any free port)")
+    parser.add_argument("--latency", type=float, default=50.0, help="Stub response latency in ms (default: 50)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Uniform +/- latency jitter in ms (default: 0)")
+    parser.add_argument("--body-size", type=int, help="Pad or truncate every page body to this many bytes")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500")
+    parser.add_argument("--reset-rate", type=float, default=0.0, help="Fraction of connections dropped without a response")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for jitter and failure injection (default: 0)")
+    parser.add_argument("--http2", action="store_true", help="Benchmark the httpx client (the stub itself speaks HTTP/1.1)")
+    parser.add_argument("--no-conditional", action="store_true", help="Disable conditional re-audit, as in audit_system.py")
+    parser.add_argument("--trace-memory", action="store_true", help="Also report peak Python heap per scenario (slower)")
+    parser.add_argument("--json", type=Path, help="Write results to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="Show the audit log while benchmarking")
+    
+    args = parser.parse_args()
+    
+    if args.record:
+        record_bodies(args.base_url, args.record)
+        return
+    
+    stub = StubServer(args.bodies, latency_ms=args.latency, jitter_ms=args.jitter, body_size=args.body_size,
+                      error_rate=args.error_rate, reset_rate=args.reset_rate, seed=args.seed)
+    base_url = stub.start(args.port)
+    print(f"{Colors.BLUE}🧪 Stub server at {base_url} (latency {args.latency:g}ms ±{args.jitter:g}ms, "
+          f"errors {args.error_rate:.0%}, resets {args.reset_rate:.0%}){Colors.NC}")
+    
+    benchmark = AuditBenchmark(stub, base_url, workers=args.workers, quiet=not args.verbose, trace_memory=args.trace_memory,
+                               audit_options={"http2": args.http2, "conditional": not args.no_conditional})
+    scenarios = ["page", "full"] if args.scenario == "all" else [args.scenario]
+    
+    results = []
+    try:
+        for scenario in scenarios:
+            results.append(benchmark.run(scenario, repeat=args.repeat))
+    finally:
+        stub.stop()
+    
+    print_results(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -171,6 +171,11 @@ recover_from_last_checkpoint() {
     
     local checkpoint_file="$AUDIT_DIR/checkpoints/checkpoint_${last_checkpoint_id}.json"
     
+    # audit_system.py stores checkpoints compressed; rebuild the plain file on demand
+    if [ ! -f "$checkpoint_file" ] && [ -f "$AUDIT_DIR/checkpoints/checkpoint_${last_checkpoint_id}.ref" ]; then
+        python3 "$AUDIT_DIR/audit_system.py" --restore-checkpoint "$last_checkpoint_id" || true
+    fi
+    
     if [ -f "$checkpoint_file" ]; then
         log "✅ Checkpoint file found: $checkpoint_file" "$GREEN"
         
@@ -263,6 +268,17 @@ recover_from_backup_checkpoint() {
     # Find most recent valid checkpoint
     local latest_checkpoint=$(find "$AUDIT_DIR/checkpoints/" -name "checkpoint_CP_*.json" -type f 2>/dev/null | sort -V | tail -1)
     
+    # Fall back to the compressed checkpoint store written by audit_system.py
+    if [ -z "$latest_checkpoint" ]; then
+        local latest_ref=$(find "$AUDIT_DIR/checkpoints/" -name "checkpoint_CP_*.ref" -type f 2>/dev/null | sort -V | tail -1)
+        if [ -n "$latest_ref" ]; then
+            local ref_id=$(basename "$latest_ref" .ref)
+            if python3 "$AUDIT_DIR/audit_system.py" --restore-checkpoint "${ref_id#checkpoint_}"; then
+                latest_checkpoint="${latest_ref%.ref}.json"
+            fi
+        fi
+    fi
+    
     if [ -n "$latest_checkpoint" ] && [ -f "$latest_checkpoint" ]; then
         log "Found potential backup checkpoint: $(basename "$latest_checkpoint")" "$YELLOW"
         
@@ -0,0 +1,1142 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the audit tool; network tests run against the benchmark's local stub server
+Run from audit_logs/: python3 -m unittest test_audit_system (or pytest)
+"""
+
+import json
+import os
+import shutil
+import signal
+import tempfile
+import threading
+import time
+import types
+import unittest
+from pathlib import Path
+
+import requests
+
+from audit_benchmark import SYNTHETIC_BODY, AuditBenchmark, StubServer, record_bodies
+from audit_system import (ApiTester, AssetParser, AuditLogger, BaselineComparator, Colors, ContentAnalyzer, HistoryStore,
+                          HostLimiter, InventoryAuditSystem, LoadTester, MetricsExporter, PageTester, ResponseCache,
+                          RouteDiscovery, SessionState, StageProfiler, mann_whitney_greater, parse_interval)
+
+class HistoryStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.history = HistoryStore(Path(self.temp_dir.name) / "audit_history.db")
+    
+    def tearDown(self):
+        self.history.close()
+        self.temp_dir.cleanup()
+    
+    def record_latencies(self, session_id: str, recorded_at: str, latencies: list) -> None:
+        self.history.record(session_id, "home", "accessibility", recorded_at,
+                            [{"test": "response_time", "status": "PASS", "details": "ok", "latency_ms": latency}
+                             for latency in latencies])
+    
+    def test_trend_is_one_mean_per_session_oldest_first(self):
+        self.record_latencies("s2", "2026-01-02T00:00:00", [200.0, 300.0])
+        self.record_latencies("s1", "2026-01-01T00:00:00", [100.0])
+        self.record_latencies("s3", "2026-01-03T00:00:00", [400.0])
+        
+        points = self.history.trend("home")
+        self.assertEqual([point["session_id"] for point in points], ["s1", "s2", "s3"])
+        self.assertEqual([point["value"] for point in points], [100.0, 250.0, 400.0])
+    
+    def test_trend_keeps_the_latest_runs(self):
+        for day in range(1, 6):
+            self.record_latencies(f"s{day}", f"2026-01-0{day}T00:00:00", [day * 10.0])
+        
+        points = self.history.trend("home", runs=2)
+        self.assertEqual([point["session_id"] for point in points], ["s4", "s5"])
+    
+    def test_trend_skips_rows_without_the_metric(self):
+        self.history.record("s1", "home", "navigation", "2026-01-01T00:00:00",
+                            [{"test": "response_time", "status": "FAIL", "details": "timeout"}])
+        self.assertEqual(self.history.trend("home"), [])
+        self.assertEqual(self.history.trend("home", metric="bytes"), [])
+
+class MannWhitneyTest(unittest.TestCase):
+    def test_shifted_sample_is_significant(self):
+        # U = 25 of 25, normal approximation with continuity correction
+        self.assertAlmostEqual(mann_whitney_greater([1, 2, 3, 4, 5], [6, 7, 8, 9, 10]), 0.0061, places=4)
+    
+    def test_direction_matters(self):
+        self.assertGreater(mann_whitney_greater([6, 7, 8, 9, 10], [1, 2, 3, 4, 5]), 0.99)
+    
+    def test_identical_or_missing_samples_are_not_regressions(self):
+        self.assertEqual(mann_whitney_greater([5, 5, 5], [5, 5, 5]), 1.0)
+        self.assertEqual(mann_whitney_greater([], [1, 2]), 1.0)
+    
+    def test_ties_are_averaged(self):
+        p_value = mann_whitney_greater([1, 2, 2, 3], [2, 3, 3, 4])
+        self.assertGreater(p_value, 0.05)
+        self.assertLess(p_value, 0.5)
+
+class AuditSystemTestCase(unittest.TestCase):
+    """A system with its own state directory; nothing here touches the network"""
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.audit_dir = Path(self.temp_dir.name)
+        self.system = self.make_system(self.audit_dir)
+    
+    def tearDown(self):
+        self.system.close()
+        self.temp_dir.cleanup()
+    
+    @staticmethod
+    def make_system(audit_dir: Path) -> InventoryAuditSystem:
+        audit_dir.mkdir(parents=True, exist_ok=True)
+        return InventoryAuditSystem(audit_dir, page_delay=0)
+    
+    def history_rows(self, system: InventoryAuditSystem, page_name: str) -> list:
+        with system.history.lock:
+            return system.history.conn.execute(
+                "SELECT session_id, phase, test, latency_ms FROM results WHERE page = ? ORDER BY id", (page_name,)).fetchall()
+
+class StubAuditTestCase(AuditSystemTestCase):
+    """Audits against the benchmark's local stub server"""
+    PAGES = 3
+    LATENCY_MS = 0
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.stub = StubServer(latency_ms=cls.LATENCY_MS)
+        cls.base_url = cls.stub.start()
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.stub.stop()
+    
+    def make_system(self, audit_dir: Path, **options) -> InventoryAuditSystem:
+        audit_dir.mkdir(parents=True, exist_ok=True)
+        system = InventoryAuditSystem(audit_dir, base_url=self.base_url, page_delay=0, conditional=False, **options)
+        # A few pages keep the suite fast
+        for page_name in list(system.pages)[self.PAGES:]:
+            del system.pages[page_name]
+        return system
+
+class Crash(BaseException):
+    """Stands in for kill -9; not an Exception, so the page loop cannot catch it"""
+
+class ResumeTest(StubAuditTestCase):
+    SECTIONS = ["timing_breakdown", "latency_profile", "asset_weights", "compression"]
+    
+    def crash(self, system: InventoryAuditSystem) -> None:
+        # Drop everything not yet flushed, like a killed process would
+        state = system.session_state
+        state.stop_event.set()
+        state.flush_thread.join()
+        state.journal.close()
+        system.http_client.close()
+        system.history.close()
+        system.logger.close()
+    
+    def interrupt_second_page(self) -> str:
+        """Crash during the compression phase of the second page"""
+        self.system.initialize_session()
+        self.system.session_state.flush_every = 10 ** 6
+        interrupted = list(self.system.pages)[1]
+        test_page_compression = self.system.page_tester.test_page_compression
+        
+        def crash_on_interrupted_page(page_name, page_url):
+            if page_name == interrupted:
+                raise Crash()
+            return test_page_compression(page_name, page_url)
+        
+        self.system.page_tester.test_page_compression = crash_on_interrupted_page
+        with self.assertRaises(Crash):
+            self.system.full_audit()
+        self.crash(self.system)
+        self.system = self.make_system(self.audit_dir)
+        return interrupted
+    
+    def test_resume_runs_only_unfinished_phases(self):
+        interrupted = self.interrupt_second_page()
+        calls = []
+        for phase, _, _, test_name, *_ in InventoryAuditSystem.PAGE_PHASES:
+            def record(page_name, page_url, phase=phase, test=getattr(self.system.page_tester, test_name)):
+                calls.append((page_name, phase))
+                return test(page_name, page_url)
+            setattr(self.system.page_tester, test_name, record)
+        
+        self.system.full_audit(resume=True)
+        
+        first, _, last = list(self.system.pages)
+        self.assertNotIn(first, [page_name for page_name, _ in calls])
+        self.assertEqual([phase for page_name, phase in calls if page_name == interrupted], ["compression"])
+        self.assertEqual([phase for page_name, phase in calls if page_name == last],
+                         [phase for phase, *_ in InventoryAuditSystem.PAGE_PHASES])
+    
+    def test_resume_rebuilds_sections_of_the_interrupted_page(self):
+        self.interrupt_second_page()
+        self.system.full_audit(resume=True)
+        
+        session = self.system.session_state.load()
+        self.assertEqual(sorted(session["progress"]["pages_completed"]), sorted(self.system.pages))
+        for section in self.SECTIONS:
+            self.assertEqual(sorted(session[section]), sorted(self.system.pages), section)
+        
+        expected_failures = {}
+        for page_name in self.system.pages:
+            for phase, *_ in InventoryAuditSystem.PAGE_PHASES:
+                results = json.loads((self.audit_dir / "pages" / f"{page_name}_{phase}_results.json").read_text())["results"]
+                if any(result["status"] == "FAIL" for result in results):
+                    expected_failures.setdefault(page_name, []).append(phase)
+        self.assertEqual(session["report"]["failures"], expected_failures)
+
+class ApiTesterTest(StubAuditTestCase):
+    def api_tester(self) -> ApiTester:
+        return ApiTester(self.system.logger, self.system.http_client, self.system.page_tester, base_url=self.base_url, samples=2)
+    
+    @staticmethod
+    def discovered(route: str, **extra) -> dict:
+        return {"route": route, "url": f"http://localhost:3000{route}", "methods": ["GET"], "dynamic": False, **extra}
+    
+    def test_discovered_routes_are_informational_unless_configured(self):
+        endpoints = self.api_tester().endpoints({
+            "api-image-cataloging-process": self.discovered("/api/image-cataloging/process"),
+            "api-reports": self.discovered("/api/reports", params={"limit": "1"}),
+            "api-upload": dict(self.discovered("/api/upload"), methods=["POST"])
+        })
+        
+        self.assertTrue(endpoints["api-image-cataloging-process"]["informational"])
+        self.assertEqual(endpoints["api-reports"], {"path": "/api/reports", "requests": [{"method": "GET", "params": {"limit": "1"}}]})
+        self.assertNotIn("api-upload", endpoints)
+        self.assertFalse(any(ApiTester.ENDPOINTS[name].get("informational") for name in ApiTester.ENDPOINTS))
+    
+    def test_configured_endpoint_is_sampled_per_request(self):
+        self.system.initialize_session()
+        passed, metrics = self.api_tester().test_endpoint("api-products", ApiTester.ENDPOINTS["api-products"])
+        
+        self.assertTrue(passed)
+        # Two samples of each of the four representative requests
+        self.assertEqual(metrics["requests"], 8)
+        self.assertEqual(metrics["status_counts"], {"200": 8})
+        self.assertEqual((metrics["unexpected_status"], metrics["invalid_json"]), (0, 0))
+        self.assertEqual(self.system.session_state.load()["error_summary"]["total"], 0)
+    
+    def test_informational_findings_do_not_count_as_errors(self):
+        self.system.initialize_session()
+        # The stub answers this path with an HTML 404: bad status and invalid JSON
+        spec = {"path": "/invalid-route-api", "requests": [{"method": "GET"}]}
+        
+        passed, metrics = self.api_tester().test_endpoint("api-discovered", dict(spec, informational=True))
+        session = self.system.session_state.load()
+        self.assertTrue(passed)
+        self.assertTrue(metrics["informational"])
+        self.assertEqual(session["error_summary"]["total"], 0)
+        self.assertNotIn("api-discovered", session["report"]["failures"])
+        
+        passed, _ = self.api_tester().test_endpoint("api-configured", spec)
+        session = self.system.session_state.load()
+        self.assertFalse(passed)
+        self.assertEqual(session["error_summary"]["high"], 2)
+        self.assertEqual(session["report"]["failures"]["api-configured"], ["api"])
+
+class SharedFindingsTest(StubAuditTestCase):
+    def results(self, page_name: str, phase: str) -> dict:
+        with open(self.audit_dir / "pages" / f"{page_name}_{phase}_results.json") as f:
+            return {result["test"]: result for result in json.load(f)["results"]}
+    
+    def test_shared_assets_are_reported_once_without_counting_errors(self):
+        self.system.initialize_session()
+        first, second = list(self.system.pages)[:2]
+        tester = self.system.page_tester
+        
+        # Every stub page loads the same assets, none of them cacheable
+        self.assertFalse(tester.test_page_assets(first, self.system.pages[first]["url"]))
+        self.assertTrue(tester.test_page_assets(second, self.system.pages[second]["url"]))
+        
+        self.assertEqual(self.results(first, "assets")["cache_headers"]["status"], "WARN")
+        self.assertEqual(self.results(second, "assets")["cache_headers"]["status"], "INFO")
+        self.assertEqual(self.system.session_state.load()["error_summary"]["total"], 0)
+        
+        # A new audit reports them again
+        self.system.initialize_session()
+        self.assertFalse(tester.test_page_assets(second, self.system.pages[second]["url"]))
+    
+    def test_uncompressed_responses_are_reported_once_per_url_without_counting_errors(self):
+        self.system.initialize_session()
+        first, second = list(self.system.pages)[:2]
+        tester = self.system.page_tester
+        
+        # The stub sends its pages uncompressed and above the size threshold
+        self.assertFalse(tester.test_page_compression(first, self.system.pages[first]["url"]))
+        self.assertTrue(tester.test_page_compression(first, self.system.pages[first]["url"]))
+        self.assertEqual(self.results(first, "compression")["compression"]["details"], "uncompressed_already_reported")
+        self.assertFalse(tester.test_page_compression(second, self.system.pages[second]["url"]))
+        
+        session = self.system.session_state.load()
+        self.assertEqual(session["error_summary"]["total"], 0)
+        self.assertEqual(session["compression"][first]["encoding"], "identity")
+
+class ConditionalReuseTest(AuditSystemTestCase):
+    def cached_entry(self) -> dict:
+        phases = {phase: {"results": [{"test": f"{phase}_check", "status": "PASS", "details": "ok"}], "metrics": None}
+                  for phase, *_ in InventoryAuditSystem.PAGE_PHASES}
+        phases["accessibility"] = {
+            "results": [{"test": "response_time", "status": "PASS", "details": "153ms", "latency_ms": 153.0}],
+            "metrics": {"timing": {"total_ms": 153.0}, "latency": {"cold_ms": 480.0}}
+        }
+        return {
+            "page": "home",
+            "recorded": "2026-01-01T00:00:00+00:00",
+            "status": "SUCCESS",
+            "phase_results": [f"{phase}:PASS" for phase in phases],
+            "errors": ["low"],
+            "phases": phases
+        }
+    
+    def test_reused_results_are_not_recorded_as_new_measurements(self):
+        for _ in range(3):
+            self.system.initialize_session()
+            self.system.reuse_page_results("home", self.cached_entry())
+        
+        self.assertEqual(self.history_rows(self.system, "home"), [])
+        self.assertEqual(self.system.history.trend("home"), [])
+    
+    def test_reuse_restores_session_sections_and_errors(self):
+        self.system.initialize_session()
+        status, phase_results = self.system.reuse_page_results("home", self.cached_entry())
+        
+        session = self.system.session_state.load()
+        self.assertEqual(status, "SUCCESS")
+        self.assertEqual(len(phase_results), len(InventoryAuditSystem.PAGE_PHASES))
+        self.assertEqual(session["timing_breakdown"]["home"], {"total_ms": 153.0})
+        self.assertEqual(session["latency_profile"]["home"], {"cold_ms": 480.0})
+        self.assertEqual(session["error_summary"]["low"], 1)
+    
+    def test_live_results_are_recorded(self):
+        session_id = self.system.initialize_session()
+        entry = self.cached_entry()
+        self.system.page_tester.save_test_results("home", "accessibility", entry["phases"]["accessibility"]["results"])
+        
+        self.assertEqual(self.history_rows(self.system, "home"), [(session_id, "accessibility", "response_time", 153.0)])
+
+class ReadOnlyCommandTest(AuditSystemTestCase):
+    def read_only_system(self, audit_dir: Path) -> InventoryAuditSystem:
+        audit_dir.mkdir(exist_ok=True)
+        system = InventoryAuditSystem(audit_dir, page_delay=0, record=False)
+        self.addCleanup(system.close)
+        return system
+    
+    def test_read_only_commands_create_no_history_or_threads(self):
+        threads = threading.active_count()
+        system = self.read_only_system(self.audit_dir / "fresh")
+        system.show_trend("home")
+        
+        self.assertEqual(threading.active_count(), threads)
+        self.assertIsNone(system.history)
+        self.assertFalse((self.audit_dir / "fresh" / "audit_history.db").exists())
+    
+    def test_trend_reads_an_existing_history(self):
+        session_id = self.system.initialize_session()
+        self.system.page_tester.save_test_results("home", "accessibility", [
+            {"test": "response_time", "status": "PASS", "details": "153.0ms", "latency_ms": 153.0}])
+        
+        system = self.read_only_system(self.audit_dir)
+        self.assertEqual([point["session_id"] for point in system.history_store().trend("home")], [session_id])
+
+class CheckpointRetentionTest(AuditSystemTestCase):
+    def backdate(self, checkpoint_id: str, created: str) -> None:
+        manifest_path = self.system.checkpoint_manager.store.manifest_path(checkpoint_id)
+        manifest = json.loads(manifest_path.read_text())
+        manifest["created"] = created
+        manifest_path.write_text(json.dumps(manifest))
+    
+    def test_sessions_never_reuse_checkpoint_ids(self):
+        first_session = self.system.initialize_session()
+        first_id = self.system.checkpoint_manager.create_checkpoint("home", "SUCCESS")
+        second_session = self.system.initialize_session()
+        second_id = self.system.checkpoint_manager.create_checkpoint("home", "SUCCESS")
+        
+        self.assertNotEqual(first_id, second_id)
+        self.assertEqual(self.system.checkpoint_manager.load_checkpoint(first_id)["session_id"], first_session)
+        self.assertEqual(self.system.checkpoint_manager.load_checkpoint(second_id)["session_id"], second_session)
+    
+    def test_numbering_continues_in_a_new_process(self):
+        self.system.initialize_session()
+        first_id = self.system.checkpoint_manager.create_checkpoint("home", "SUCCESS")
+        self.system.close()
+        
+        self.system = self.make_system(self.audit_dir)
+        self.system.initialize_session()
+        second_id = self.system.checkpoint_manager.create_checkpoint("home", "SUCCESS")
+        self.assertGreater(int(second_id.split("_")[1]), int(first_id.split("_")[1]))
+    
+    def test_prune_keeps_one_checkpoint_per_day_across_sessions(self):
+        first_session = self.system.initialize_session()
+        first_id = self.system.checkpoint_manager.create_checkpoint("home", "SUCCESS")
+        self.backdate(first_id, "2026-01-01T12:00:00+00:00")
+        self.system.initialize_session()
+        self.system.checkpoint_manager.create_checkpoint("home", "SUCCESS")
+        latest_id = self.system.checkpoint_manager.create_checkpoint("dashboard", "SUCCESS")
+        
+        store = self.system.checkpoint_manager.store
+        removed, _ = store.prune(keep_last=1, keep_daily=2)
+        kept = [manifest["checkpoint_id"] for manifest in store.manifests()]
+        self.assertEqual(removed, 1)
+        self.assertEqual(kept, [first_id, latest_id])
+        
+        restored_file = self.system.checkpoint_manager.restore_checkpoint(first_id)
+        self.assertEqual(json.loads(restored_file.read_text())["session_id"], first_session)
+        
+        store.prune(keep_last=1, keep_daily=1)
+        self.assertEqual([manifest["checkpoint_id"] for manifest in store.manifests()], [latest_id])
+
+class MetricsLabelTest(unittest.TestCase):
+    def setUp(self):
+        self.exporter = MetricsExporter(None, {"home": {"url": "http://localhost:3000/"}})
+    
+    def test_catalog_pages_use_their_name(self):
+        self.assertEqual(self.exporter.page_label("http://localhost:3000/"), "home")
+    
+    def test_hashed_assets_share_one_label_per_type(self):
+        labels = {self.exporter.page_label(f"http://localhost:3000/_next/static/chunks/{digest}.js")
+                  for digest in ("a1b2c3d4e5f60718", "ffee0011aabbccdd", "main-app")}
+        self.assertEqual(labels, {"asset:js"})
+        self.assertEqual(self.exporter.page_label("http://localhost:3000/_next/static/css/9f8e7d.css"), "asset:css")
+        self.assertEqual(self.exporter.page_label("http://localhost:3000/img/p.png?w=64"), "asset:image")
+    
+    def test_ids_in_other_paths_are_collapsed(self):
+        self.assertEqual(self.exporter.page_label("http://localhost:3000/api/products/42"), "/api/products/:id")
+        self.assertEqual(self.exporter.page_label("http://localhost:3000/invalid-route-1718000000"), "/:id")
+
+class ShardMergeTest(unittest.TestCase):
+    """Shards are audited through the same bookkeeping calls a real page audit makes"""
+    SHARDS = 2
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.systems = []
+    
+    def tearDown(self):
+        for system in self.systems:
+            system.close()
+        self.temp_dir.cleanup()
+    
+    def make_system(self, name: str) -> InventoryAuditSystem:
+        system = AuditSystemTestCase.make_system(self.root / name)
+        self.systems.append(system)
+        return system
+    
+    @staticmethod
+    def fake_audit(system: InventoryAuditSystem, page_name: str) -> None:
+        # Deterministic per page, so a shard and a single run record the same outcome
+        failed = page_name.startswith("p")
+        latency_ms = float(len(page_name) * 10)
+        tester = system.page_tester
+        tester.save_test_results(page_name, "accessibility", [
+            {"test": "response_time", "status": "FAIL" if failed else "PASS", "details": f"{latency_ms}ms", "latency_ms": latency_ms}
+        ])
+        with system.session_state.update() as session:
+            session.setdefault("latency_profile", {})[page_name] = {"cold_ms": latency_ms, "samples": 0}
+        if failed:
+            tester.update_error_count("high")
+        tester.update_error_count("low")
+        status = "FAILED" if failed else "SUCCESS"
+        system.checkpoint_manager.create_micro_checkpoint(page_name, "accessibility_complete", status)
+        system.create_page_summary(page_name, system.pages[page_name]["url"], status, [f"accessibility:{status}"])
+        system.checkpoint_manager.create_checkpoint(page_name, status)
+    
+    def run_shards(self, by: str, skip: int = 0) -> list:
+        shard_dirs = []
+        for index in range(self.SHARDS):
+            system = self.make_system(f"shard_{by}_{index}")
+            system.select_shard(index, self.SHARDS, by)
+            system.initialize_session()
+            for page_name in list(system.pages)[skip:]:
+                self.fake_audit(system, page_name)
+            system.session_state.flush()
+            shard_dirs.append(system.audit_dir)
+        return shard_dirs
+    
+    @staticmethod
+    def snapshot(system: InventoryAuditSystem) -> dict:
+        session = system.session_state.load()
+        history = list(system.session_state.checkpoint_history())
+        with system.history.lock:
+            rows = system.history.conn.execute("SELECT page, phase, test, status, latency_ms FROM results ORDER BY page").fetchall()
+        # Timestamps differ between runs; everything else should not
+        pages = {page_name: {key: value for key, value in entry.items() if key != "timestamp"}
+                 for page_name, entry in session["report"]["pages"].items()}
+        return {
+            "report": [list(pages.items()), list(session["report"]["failures"].items())],
+            "latency_profile": list(session["latency_profile"].items()),
+            "error_summary": session["error_summary"],
+            "progress": {key: session["progress"][key] for key in ("pages_completed", "pages_remaining", "completion_percentage")},
+            "checkpoints": [checkpoint.get("checkpoint_id") or checkpoint["id"] for checkpoint in history],
+            "history": rows,
+            "results_files": sorted(path.name for path in (system.audit_dir / "pages").glob("*"))
+        }
+    
+    def single_run(self) -> dict:
+        system = self.make_system("single")
+        system.initialize_session()
+        for page_name in system.pages:
+            self.fake_audit(system, page_name)
+        return self.snapshot(system)
+    
+    def test_merge_matches_a_single_process_run(self):
+        expected = self.single_run()
+        for by in ("hash", "risk"):
+            with self.subTest(by=by):
+                shard_dirs = self.run_shards(by)
+                merged = self.make_system(f"merged_{by}")
+                self.assertTrue(merged.merge_shards(shard_dirs))
+                self.assertEqual(self.snapshot(merged), expected)
+    
+    def test_shards_split_the_catalog(self):
+        for by in ("hash", "risk"):
+            assigned = []
+            for index in range(3):
+                system = self.make_system(f"split_{by}_{index}")
+                system.select_shard(index, 3, by)
+                assigned.extend(system.pages)
+            catalog = list(self.make_system(f"full_{by}").pages)
+            self.assertEqual(sorted(assigned), sorted(catalog))
+    
+    def test_incomplete_shard_is_not_merged(self):
+        shard_dirs = self.run_shards("hash", skip=1)
+        merged = self.make_system("merged")
+        self.assertFalse(merged.merge_shards(shard_dirs))
+        self.assertFalse(merged.session_state.exists())
+        self.assertFalse(merged.merge_shards([self.root / "missing"]))
+
+class CountingClient:
+    """Stands in for HttpClient; answers every GET with the same response or error"""
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+    
+    def get(self, url: str, timeout: int = 10):
+        self.calls.append(url)
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+class ResponseCacheTest(AuditSystemTestCase):
+    def test_each_url_is_fetched_once(self):
+        client = CountingClient(requests.Response())
+        cache = ResponseCache(self.system.logger, client)
+        
+        first = cache.get("http://localhost:3000/products")
+        self.assertIs(cache.get("http://localhost:3000/products"), first)
+        cache.get("http://localhost:3000/orders")
+        
+        self.assertEqual(client.calls, ["http://localhost:3000/products", "http://localhost:3000/orders"])
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+    
+    def test_network_errors_are_cached_for_every_phase(self):
+        client = CountingClient(requests.ConnectionError("refused"))
+        cache = ResponseCache(self.system.logger, client)
+        
+        for _ in range(3):
+            with self.assertRaises(requests.ConnectionError):
+                cache.get("http://localhost:3000/")
+        self.assertEqual(len(client.calls), 1)
+    
+    def test_clear_and_other_threads_start_empty(self):
+        client = CountingClient(requests.Response())
+        cache = ResponseCache(self.system.logger, client)
+        cache.get("http://localhost:3000/")
+        
+        worker = threading.Thread(target=cache.get, args=("http://localhost:3000/",))
+        worker.start()
+        worker.join()
+        cache.clear()
+        cache.get("http://localhost:3000/")
+        
+        self.assertEqual(len(client.calls), 3)
+
+class HostLimiterTest(unittest.TestCase):
+    def peak_concurrency(self, limiter: HostLimiter, urls: list) -> int:
+        lock = threading.Lock()
+        active = [0]
+        peak = [0]
+        
+        def request(url: str) -> None:
+            with limiter.slot(url):
+                with lock:
+                    active[0] += 1
+                    peak[0] = max(peak[0], active[0])
+                time.sleep(0.02)
+                with lock:
+                    active[0] -= 1
+        
+        threads = [threading.Thread(target=request, args=(url,)) for url in urls]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return peak[0]
+    
+    def test_requests_to_one_host_are_capped(self):
+        urls = [f"http://localhost:3000/page{index}" for index in range(8)]
+        self.assertEqual(self.peak_concurrency(HostLimiter(2), urls), 2)
+    
+    def test_hosts_are_limited_independently(self):
+        urls = ["http://localhost:3000/", "http://127.0.0.1:3000/", "http://localhost:4000/"]
+        self.assertEqual(self.peak_concurrency(HostLimiter(1), urls), 3)
+
+class ConcurrentAuditTest(StubAuditTestCase):
+    PAGES = 4
+    
+    def test_workers_complete_every_page(self):
+        self.system.initialize_session()
+        self.system.full_audit(workers=3)
+        
+        session = self.system.session_state.load()
+        self.assertCountEqual(session["progress"]["pages_completed"], self.system.pages)
+        self.assertCountEqual(session["report"]["pages"], self.system.pages)
+
+class HttpClientTest(StubAuditTestCase):
+    def test_requests_reuse_one_keep_alive_connection(self):
+        client = self.system.http_client
+        for _ in range(5):
+            client.get(f"{self.base_url}/dashboard")
+        
+        stats = client.connection_stats()
+        self.assertEqual(stats["protocol"], "HTTP/1.1")
+        self.assertEqual((stats["requests"], stats["connections_opened"], stats["connections_reused"]), (5, 1, 4))
+        self.assertEqual(stats["reuse_ratio"], 80.0)
+    
+    def test_connection_stats_are_recorded_in_the_session(self):
+        self.system.initialize_session()
+        self.system.http_client.get(self.base_url)
+        self.system.record_connection_stats()
+        
+        self.assertEqual(self.system.session_state.load()["connection_stats"]["requests"], 1)
+
+class SessionStateTest(AuditSystemTestCase):
+    def setUp(self):
+        super().setUp()
+        self.system.initialize_session()
+        self.state = self.system.session_state
+        # Only the event count triggers flushes here
+        self.state.stop_event.set()
+        self.state.flush_thread.join()
+        self.state.flush_interval = 10 ** 6
+        self.state.flush_every = 5
+    
+    def on_disk(self) -> dict:
+        return json.loads(self.state.session_file.read_text())
+    
+    def test_events_are_flushed_in_batches(self):
+        flushes = self.state.flush_count
+        for _ in range(4):
+            self.state.record({"event": "error", "level": "low"})
+        
+        self.assertEqual(self.state.flush_count, flushes)
+        self.assertEqual(self.on_disk()["error_summary"]["low"], 0)
+        self.assertEqual(self.state.load()["error_summary"]["low"], 4)
+        
+        self.state.record({"event": "error", "level": "low"})
+        self.assertEqual(self.state.flush_count, flushes + 1)
+        self.assertEqual(self.on_disk()["error_summary"]["low"], 5)
+    
+    def test_close_writes_pending_changes(self):
+        with self.state.update() as session:
+            session["current_operation"]["phase"] = "navigation"
+        self.assertNotEqual(self.on_disk()["current_operation"]["phase"], "navigation")
+        
+        self.state.close()
+        self.assertEqual(self.on_disk()["current_operation"]["phase"], "navigation")
+        self.assertEqual(json.loads(self.state.status_file.read_text())["session_id"], self.state.load()["session_id"])
+
+class CheckpointJournalTest(AuditSystemTestCase):
+    def setUp(self):
+        super().setUp()
+        self.session_id = self.system.initialize_session()
+        self.system.session_state.flush_every = 10 ** 6
+        self.system.session_state.flush_interval = 10 ** 6
+        self.journal_path = self.system.session_state.journal.path
+    
+    def record_events(self) -> str:
+        for _ in range(3):
+            self.system.page_tester.update_error_count("low")
+        return self.system.checkpoint_manager.create_micro_checkpoint("home", "accessibility_start", "IN_PROGRESS")
+    
+    def reopened(self) -> dict:
+        state = SessionState(self.audit_dir)
+        self.addCleanup(state.close)
+        return state.load()
+    
+    def test_events_are_appended_not_rewritten(self):
+        header = self.journal_path.read_text().splitlines()[0]
+        self.record_events()
+        
+        lines = self.journal_path.read_text().splitlines()
+        self.assertEqual(lines[0], header)
+        self.assertEqual([json.loads(line)["seq"] for line in lines], list(range(5)))
+    
+    def test_unflushed_events_are_replayed_on_load(self):
+        checkpoint_id = self.record_events()
+        self.assertEqual(json.loads(self.system.session_state.session_file.read_text())["error_summary"]["low"], 0)
+        
+        session = self.reopened()
+        self.assertEqual(session["session_id"], self.session_id)
+        self.assertEqual(session["error_summary"]["low"], 3)
+        self.assertEqual(session["checkpoint_history"][-1]["id"], checkpoint_id)
+        self.assertEqual(session["checkpoint_journal"]["last_seq"], 4)
+    
+    def test_torn_final_line_is_ignored(self):
+        self.record_events()
+        with open(self.journal_path, "a") as f:
+            f.write('{"seq": 5, "event": "err')
+        
+        self.assertEqual(self.reopened()["error_summary"]["low"], 3)
+
+class AuditLoggerTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.audit_dir = Path(self.temp_dir.name)
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def logger(self, **options) -> AuditLogger:
+        logger = AuditLogger(self.audit_dir, **options)
+        self.addCleanup(logger.close)
+        return logger
+    
+    def test_messages_are_written_in_order_through_one_handle(self):
+        logger = self.logger()
+        logger.log("first")
+        logger.flush()
+        handle = logger.handle
+        for index in range(50):
+            logger.log(f"message {index}", Colors.GREEN)
+        logger.flush()
+        
+        lines = (self.audit_dir / "master_audit.log").read_text().splitlines()
+        self.assertIs(logger.handle, handle)
+        self.assertEqual([line.split(" - ", 1)[1] for line in lines], ["first"] + [f"message {index}" for index in range(50)])
+        self.assertNotIn("\033", lines[1])
+    
+    def test_json_format_writes_one_record_per_line(self):
+        logger = self.logger(log_format="json")
+        logger.log("Slow page", Colors.YELLOW)
+        logger.close()
+        
+        record = json.loads((self.audit_dir / "master_audit.jsonl").read_text())
+        self.assertEqual((record["level"], record["message"]), ("warning", "Slow page"))
+    
+    def test_close_writes_queued_messages(self):
+        logger = self.logger(flush_interval=60)
+        logger.log("last words")
+        logger.close()
+        
+        self.assertFalse(logger.writer.is_alive())
+        self.assertIn("last words", (self.audit_dir / "master_audit.log").read_text())
+
+class LoadTesterTest(StubAuditTestCase):
+    def load_tester(self, **options) -> LoadTester:
+        return LoadTester(self.system.logger, self.system.http_client, self.system.page_tester, **options)
+    
+    def test_request_budget_is_shared_by_all_clients(self):
+        tester = self.load_tester(clients=4, total_requests=20)
+        metrics = tester.summarize(tester.run_load(f"{self.base_url}/products"))
+        
+        self.assertEqual((metrics["clients"], metrics["requests"], metrics["error_rate"]), (4, 20, 0.0))
+        self.assertLessEqual(metrics["p50_ms"], metrics["p90_ms"])
+        self.assertLessEqual(metrics["p99_ms"], metrics["max_ms"])
+    
+    def test_error_responses_fail_the_page(self):
+        self.system.initialize_session()
+        passed, metrics = self.load_tester(clients=2, total_requests=6).test_page_load("missing", f"{self.base_url}/invalid-route")
+        
+        self.assertFalse(passed)
+        self.assertEqual(metrics["errors"], {"status_404": 6})
+        self.assertEqual(metrics["error_rate"], 100.0)
+        self.assertEqual(self.system.session_state.load()["error_summary"]["high"], 1)
+
+class TimingBreakdownTest(StubAuditTestCase):
+    LATENCY_MS = 30
+    
+    def test_new_and_reused_connections_are_split_into_phases(self):
+        first = self.system.http_client.get(self.base_url)
+        second = self.system.http_client.get(self.base_url)
+        
+        self.assertFalse(first.timing["connection_reused"])
+        self.assertTrue(second.timing["connection_reused"])
+        self.assertEqual((second.timing["dns_ms"], second.timing["connect_ms"], second.timing["tls_ms"]), (0.0, 0.0, 0.0))
+        for timing in (first.timing, second.timing):
+            # The stub answers after its injected latency, so the wait lands in TTFB
+            self.assertGreaterEqual(timing["ttfb_ms"], self.LATENCY_MS)
+            parts = sum(timing[key] or 0.0 for key in ("dns_ms", "connect_ms", "tls_ms", "ttfb_ms", "download_ms"))
+            self.assertAlmostEqual(parts, timing["total_ms"], delta=1.0)
+    
+    def test_accessibility_records_the_breakdown(self):
+        self.system.initialize_session()
+        page_name = next(iter(self.system.pages))
+        self.system.page_tester.test_page_accessibility(page_name, self.system.pages[page_name]["url"])
+        
+        timing = self.system.session_state.load()["timing_breakdown"][page_name]
+        self.assertGreaterEqual(timing["ttfb_ms"], self.LATENCY_MS)
+
+class ContentAnalyzerTest(unittest.TestCase):
+    @staticmethod
+    def occurrences(text: str, term: str) -> int:
+        text = text.lower()
+        return sum(1 for index in range(len(text)) if text.startswith(term, index))
+    
+    def assert_counts_match(self, terms: list, text: str) -> None:
+        hits = ContentAnalyzer(terms).analyze(text)
+        for term in set(term.lower() for term in terms):
+            with self.subTest(term=term):
+                self.assertEqual(hits.count(term), self.occurrences(text, term))
+    
+    def test_overlapping_and_nested_terms_are_all_counted(self):
+        self.assert_counts_match(["ai", "AI agent", "agent", "age", "nav", "navigation", "aaa"],
+                                 "AI Agent navigation: ai agents, aaaa, nav NAV agentage")
+    
+    def test_page_terms_match_a_naive_scan(self):
+        self.assert_counts_match(PageTester.CONTENT_TERMS, SYNTHETIC_BODY)
+    
+    def test_a_response_is_analyzed_once(self):
+        analyzer = ContentAnalyzer(["product", "barcode"])
+        response = types.SimpleNamespace(text="product products")
+        hits = analyzer.analyze_response(response)
+        response.text = ""
+        
+        self.assertIs(analyzer.analyze_response(response), hits)
+        self.assertEqual(hits.count("product"), 2)
+        self.assertFalse(hits.found("barcode"))
+        self.assertTrue(hits.any(["barcode", "product"]))
+
+class RouteDiscoveryTest(AuditSystemTestCase):
+    ROUTE_FILES = {
+        "page.tsx": "",
+        "(shop)/products/[id]/page.tsx": "",
+        "docs/[[...slug]]/page.tsx": "",
+        "orders/[orderId]/page.tsx": "",
+        "_components/page.tsx": "",
+        "api/reports/route.ts": "export async function GET() {}\nexport const POST = handler\n"
+    }
+    
+    def setUp(self):
+        super().setUp()
+        self.app_dir = self.audit_dir / "app"
+        for relative, source in self.ROUTE_FILES.items():
+            path = self.app_dir / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(source)
+        self.samples_file = self.audit_dir / "route_samples.json"
+        self.samples_file.write_text(json.dumps({"segments": {"id": "42"}, "api_queries": {"/api/reports": {"limit": "1"}}}))
+    
+    def discovery(self) -> RouteDiscovery:
+        return RouteDiscovery(self.app_dir, self.audit_dir / "route_index.json", self.system.logger,
+                              samples_file=self.samples_file)
+    
+    def test_routes_are_described_from_the_app_directory(self):
+        routes = {route["route"]: route for route in self.discovery().load_index()["routes"]}
+        
+        self.assertCountEqual(routes, ["/", "/products/[id]", "/docs/[[...slug]]", "/orders/[orderId]", "/api/reports"])
+        self.assertEqual((routes["/"]["name"], routes["/"]["risk_level"]), ("home", "low"))
+        self.assertEqual(routes["/products/[id]"]["url"], "http://localhost:3000/products/42")
+        self.assertEqual(routes["/products/[id]"]["risk_level"], "high")
+        # Optional catch-alls drop out without a sample; required segments make the route unreachable
+        self.assertEqual(routes["/docs/[[...slug]]"]["url"], "http://localhost:3000/docs")
+        self.assertIsNone(routes["/orders/[orderId]"]["url"])
+        self.assertEqual(routes["/api/reports"]["methods"], ["GET", "POST"])
+        self.assertEqual(routes["/api/reports"]["params"], {"limit": "1"})
+    
+    def test_index_is_reused_until_route_files_change(self):
+        generated = self.discovery().load_index()["generated"]
+        self.assertEqual(self.discovery().load_index()["generated"], generated)
+        
+        (self.app_dir / "customers").mkdir()
+        (self.app_dir / "customers" / "page.tsx").write_text("")
+        index = self.discovery().load_index()
+        self.assertNotEqual(index["generated"], generated)
+        self.assertIn("/customers", [route["route"] for route in index["routes"]])
+
+class BaselineComparatorTest(StubAuditTestCase):
+    def setUp(self):
+        super().setUp()
+        self.system.initialize_session()
+        self.baseline_dir = self.audit_dir / "baseline"
+        (self.baseline_dir / "performance_benchmarks").mkdir(parents=True)
+        (self.baseline_dir / "comparison_config.json").write_text(json.dumps(
+            {"regression_detection": {"response_time_degradation": "+20%", "content_size_reduction": "-10%"}}))
+        self.page_url = f"{self.base_url}/products"
+    
+    def comparator(self, distribution: dict = None) -> BaselineComparator:
+        benchmarks = {"page_distributions": {"products": distribution}} if distribution else {}
+        (self.baseline_dir / "performance_benchmarks" / "baseline_performance.json").write_text(json.dumps(benchmarks))
+        return BaselineComparator(self.baseline_dir, self.system.logger, self.system.http_client, self.system.page_tester, samples=8)
+    
+    def test_thresholds_come_from_the_config(self):
+        comparator = self.comparator()
+        self.assertEqual((comparator.latency_threshold, comparator.size_threshold), (0.2, -0.1))
+    
+    def test_first_run_records_the_distribution(self):
+        passed, result = self.comparator().compare_page("products", self.page_url)
+        
+        stored = json.loads((self.baseline_dir / "performance_benchmarks" / "baseline_performance.json").read_text())
+        self.assertTrue(passed)
+        self.assertEqual(result["verdict"], "RECORDED")
+        self.assertEqual(len(stored["page_distributions"]["products"]["latency_ms"]), 8)
+    
+    def test_consistently_slower_page_is_a_regression(self):
+        size = [len(SYNTHETIC_BODY)] * 8
+        passed, result = self.comparator({"latency_ms": [0.01] * 8, "size_bytes": size}).compare_page("products", self.page_url)
+        
+        self.assertFalse(passed)
+        self.assertEqual(result["verdict"], "REGRESSION")
+        self.assertTrue(result["latency_regressed"])
+        self.assertFalse(result["size_regressed"])
+    
+    def test_faster_page_is_not_a_regression(self):
+        size = [len(SYNTHETIC_BODY)] * 8
+        passed, result = self.comparator({"latency_ms": [10000.0] * 8, "size_bytes": size}).compare_page("products", self.page_url)
+        
+        self.assertTrue(passed)
+        self.assertEqual(result["verdict"], "OK")
+
+class ReportAggregateTest(AuditSystemTestCase):
+    FAIL = [{"test": "http_status", "status": "FAIL", "details": "500"}]
+    PASS = [{"test": "http_status", "status": "PASS", "details": "200"}]
+    
+    def setUp(self):
+        super().setUp()
+        self.system.initialize_session()
+    
+    def failures(self) -> dict:
+        return self.system.session_state.load()["report"]["failures"]
+    
+    def test_failure_index_follows_the_latest_results(self):
+        tester = self.system.page_tester
+        tester.save_test_results("home", "accessibility", self.FAIL)
+        tester.save_test_results("home", "functionality", self.FAIL)
+        self.assertEqual(self.failures(), {"home": ["accessibility", "functionality"]})
+        
+        tester.save_test_results("home", "accessibility", self.PASS)
+        tester.save_test_results("home", "functionality", self.PASS)
+        self.assertEqual(self.failures(), {})
+    
+    def test_report_is_rendered_from_the_aggregate(self):
+        self.system.page_tester.save_test_results("products", "accessibility", self.FAIL)
+        self.system.page_tester.update_error_count("high")
+        for page_name, status in (("home", "SUCCESS"), ("products", "SUCCESS")):
+            self.system.create_page_summary(page_name, self.system.pages[page_name]["url"], status,
+                                            [f"{phase}:PASS" for phase, *_ in InventoryAuditSystem.PAGE_PHASES])
+            self.system.checkpoint_manager.create_checkpoint(page_name, status)
+        # Neither the per-page files nor the results files are read back
+        for path in (self.audit_dir / "pages").iterdir():
+            path.unlink()
+        
+        self.system.generate_final_report()
+        report = next((self.audit_dir / "reports").glob("final_audit_report_*.md")).read_text()
+        self.assertIn("### home", report)
+        self.assertIn("### products", report)
+        self.assertIn("- ✅ **compression**: PASSED", report)
+        self.assertIn("- **products**: Critical functionality issues detected", report)
+        self.assertNotIn("- **home**: Critical", report)
+
+class DaemonScheduleTest(AuditSystemTestCase):
+    def test_named_and_duration_intervals(self):
+        self.assertEqual(parse_interval("weekly"), 7 * 86400)
+        self.assertEqual(parse_interval("6h"), 6 * 3600)
+        self.assertEqual(parse_interval("1.5 m"), 90)
+        with self.assertRaises(ValueError):
+            parse_interval("fortnightly")
+    
+    def test_pages_are_probed_on_the_cadence_of_their_risk(self):
+        (self.audit_dir / "baseline").mkdir()
+        (self.audit_dir / "baseline" / "comparison_config.json").write_text(json.dumps({"monitoring_schedule": {
+            "high_risk_pages": "1s", "medium_risk_pages": "4s", "low_risk_pages": "1000s", "full_system_audit": "1000s"}}))
+        self.system.pages = {"products": dict(self.system.pages["products"]),
+                             "orders": dict(self.system.pages["orders"], risk_level="medium"),
+                             "home": dict(self.system.pages["home"], risk_level="low")}
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            self.addCleanup(signal.signal, signum, signal.getsignal(signum))
+        
+        audits = []
+        
+        def audit_page(page_name):
+            audits.append(page_name)
+            if len(audits) == 12:
+                os.kill(os.getpid(), signal.SIGINT)
+        
+        self.system.audit_page = audit_page
+        self.system.run_daemon(interval_scale=0.05, jitter=0.0)
+        
+        counts = {page_name: audits.count(page_name) for page_name in self.system.pages}
+        self.assertEqual(len(audits), 12)
+        self.assertGreater(counts["products"], counts["orders"])
+        self.assertEqual(counts["home"], 1)
+
+class StageProfilerTest(unittest.TestCase):
+    def setUp(self):
+        self.profiler = StageProfiler()
+        self.profiler.start()
+        self.profiler.context("home", "accessibility")
+    
+    def test_nested_stages_are_charged_exclusive_time(self):
+        with self.profiler.stage("analysis"):
+            time.sleep(0.02)
+            with self.profiler.stage("fetch"):
+                time.sleep(0.05)
+        
+        stages = self.profiler.totals[("home", "accessibility")]
+        self.assertGreaterEqual(stages["fetch"], 0.05)
+        self.assertGreaterEqual(stages["analysis"], 0.02)
+        self.assertLess(stages["analysis"], 0.045)
+    
+    def test_nothing_is_recorded_until_started(self):
+        profiler = StageProfiler()
+        
+        @profiler.timed("session")
+        def flush():
+            return "flushed"
+        
+        self.assertEqual(flush(), "flushed")
+        self.assertEqual(profiler.totals, {})
+    
+    def test_table_has_a_column_per_used_stage_and_totals(self):
+        with self.profiler.stage("fetch"):
+            pass
+        self.profiler.context("orders", "navigation")
+        with self.profiler.stage("log"):
+            pass
+        
+        lines = self.profiler.table()
+        self.assertEqual(lines[0].split(), ["page", "phase", "fetch", "log", "total"])
+        self.assertEqual([line.split()[0] for line in lines[2:4]], ["home", "orders"])
+        self.assertTrue(lines[-1].startswith("TOTAL"))
+
+class StubServerTest(unittest.TestCase):
+    def start(self, **options) -> str:
+        stub = StubServer(latency_ms=0, **options)
+        self.addCleanup(stub.stop)
+        self.stub = stub
+        return stub.start()
+    
+    def test_body_size_and_stats(self):
+        base_url = self.start(body_size=1000)
+        response = requests.get(f"{base_url}/products")
+        
+        self.assertEqual((response.status_code, len(response.content)), (200, 1000))
+        self.assertEqual(self.stub.stats.snapshot(), {"requests": 1, "bytes_sent": 1000, "failures": 0})
+    
+    def test_injected_errors_are_counted(self):
+        base_url = self.start(error_rate=1.0)
+        
+        self.assertEqual(requests.get(base_url).status_code, 500)
+        self.assertEqual(self.stub.stats.snapshot()["failures"], 1)
+    
+    def test_recorded_bodies_are_replayed(self):
+        bodies_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, bodies_dir)
+        record_bodies(self.start(body_size=500), bodies_dir)
+        self.stub.stop()
+        
+        replay_url = self.start(bodies_dir=bodies_dir)
+        self.assertEqual(len(requests.get(f"{replay_url}/orders").content), 500)
+        self.assertEqual(len(requests.get(f"{replay_url}/unrecorded").content), len(SYNTHETIC_BODY))
+    
+    def test_benchmark_reports_one_pass_over_the_catalog(self):
+        base_url = self.start()
+        result = AuditBenchmark(self.stub, base_url).run("page")
+        
+        with tempfile.TemporaryDirectory() as scratch:
+            catalog = InventoryAuditSystem(Path(scratch), record=False)
+            catalog.close()
+        self.assertEqual(result["pages"], len(catalog.pages))
+        self.assertGreater(result["requests"], result["pages"])
+        self.assertEqual(result["injected_failures"], 0)
+
+class AssetWeightTest(StubAuditTestCase):
+    def test_parser_collects_unique_absolute_assets(self):
+        parser = AssetParser()
+        parser.feed("<link rel='stylesheet' href='/app.css'><link rel='preload' as='font' href='/f.woff2'>"
+                    "<link rel='icon' href='/favicon.ico'><script src='/main.js'></script><script src='/main.js#x'></script>"
+                    "<img srcset='/a.png 1x, /a@2x.png 2x'><img src='data:image/png;base64,AA'><script>inline()</script>")
+        
+        self.assertEqual(parser.assets("http://localhost:3000/products"), {
+            "http://localhost:3000/app.css": "stylesheet",
+            "http://localhost:3000/f.woff2": "font",
+            "http://localhost:3000/favicon.ico": "image",
+            "http://localhost:3000/main.js": "script",
+            "http://localhost:3000/a.png": "image"
+        })
+        self.assertEqual(len(parser.references), 7)
+    
+    def test_page_weight_is_summarized_and_shared_assets_fetched_once(self):
+        self.system.initialize_session()
+        first, second = list(self.system.pages)[:2]
+        tester = self.system.page_tester
+        
+        tester.test_page_assets(first, self.system.pages[first]["url"])
+        requests_before = self.stub.stats.snapshot()["requests"]
+        tester.test_page_assets(second, self.system.pages[second]["url"])
+        
+        summary = self.system.session_state.load()["asset_weights"][first]
+        self.assertEqual(summary["assets"], 3)
+        self.assertEqual(summary["total_bytes"], sum(summary["by_kind"].values()))
+        self.assertEqual(summary["missing_cache_headers"], 3)
+        # Only the second page itself; its assets come from the cache
+        self.assertEqual(self.stub.stats.snapshot()["requests"] - requests_before, 1)
+
+class CompressionTest(StubAuditTestCase):
+    def verdict(self, **summary) -> str:
+        results = []
+        summary = dict({"wire_bytes": 4000, "decoded_bytes": 20000, "identity_bytes": 20000, "ratio": 5.0}, **summary)
+        self.system.page_tester.compression_results("http://localhost:3000/products", summary, results)
+        return results[0]["status"], results[0]["details"]
+    
+    def test_verdict_depends_on_encoding_and_size(self):
+        self.system.initialize_session()
+        self.assertEqual(self.verdict(encoding="br"), ("PASS", "br"))
+        self.assertEqual(self.verdict(encoding="identity", decoded_bytes=2000), ("INFO", "small_uncompressed"))
+    
+    def test_uncompressed_page_sizes_are_measured(self):
+        self.system.initialize_session()
+        page_name = next(iter(self.system.pages))
+        self.system.page_tester.test_page_compression(page_name, self.system.pages[page_name]["url"])
+        
+        summary = self.system.session_state.load()["compression"][page_name]
+        self.assertEqual(summary["encoding"], "identity")
+        self.assertEqual(summary["wire_bytes"], len(SYNTHETIC_BODY))
+        self.assertEqual((summary["decoded_bytes"], summary["identity_bytes"], summary["ratio"]),
+                         (len(SYNTHETIC_BODY), len(SYNTHETIC_BODY), 1.0))
+
+class ColdStartTest(StubAuditTestCase):
+    def audit_first_page(self, system: InventoryAuditSystem) -> dict:
+        system.initialize_session()
+        page_name = next(iter(system.pages))
+        requests_before = self.stub.stats.snapshot()["requests"]
+        system.page_tester.test_page_accessibility(page_name, system.pages[page_name]["url"])
+        latency = system.session_state.load()["latency_profile"][page_name]
+        return dict(latency, requests=self.stub.stats.snapshot()["requests"] - requests_before)
+    
+    def report(self, system: InventoryAuditSystem) -> str:
+        system.checkpoint_manager.create_checkpoint(next(iter(system.pages)), "SUCCESS")
+        system.generate_final_report()
+        return next((system.audit_dir / "reports").glob("final_audit_report_*.md")).read_text()
+    
+    def test_default_keeps_the_single_cold_request(self):
+        latency = self.audit_first_page(self.system)
+        
+        self.assertEqual((latency["samples"], latency["warm_p50_ms"], latency["requests"]), (0, None, 1))
+        self.assertNotIn("Cold Start vs Steady State", self.report(self.system))
+    
+    def test_warm_samples_follow_discarded_warm_up_requests(self):
+        self.system.close()
+        self.system = self.make_system(self.audit_dir, warmup=2, latency_samples=3)
+        latency = self.audit_first_page(self.system)
+        
+        self.assertEqual((latency["warmup"], latency["samples"], latency["requests"]), (2, 3, 6))
+        self.assertIsNotNone(latency["warm_p90_ms"])
+        self.assertAlmostEqual(latency["cold_start_ms"], latency["cold_ms"] - latency["warm_p50_ms"], delta=0.11)
+        self.assertIn("Cold Start vs Steady State", self.report(self.system))
+
+if __name__ == "__main__":
+    unittest.main()